@@ -1,15 +1,18 @@
-import datetime
 import time
 import requests
 from requests.auth import AuthBase
-from typing import Optional
+from typing import Optional, Tuple
 from dirmapper_core.utils.logger import logger
+from ..utils.rate_limiter import TokenBucket
 from ..utils.request_utils import make_request_with_retry
 
 class GitHubAuthManager(AuthBase):
     """
     GitHubAuthManager handles authentication with the GitHub API using an OAuth token.
     """
+    # Seconds a token validation result is reused before asking the API again
+    TOKEN_VALIDATION_TTL = 300
+
     def __init__(self, oauth_token: str):
         """
         Initialize the GitHubAuthManager with an OAuth token.
@@ -18,6 +21,9 @@ class GitHubAuthManager(AuthBase):
             oauth_token (str): The OAuth token provided by the user.
         """
         self.oauth_token = oauth_token
+        # Shared by every manager using this token, so they draw from one quota
+        self.rate_limiter = TokenBucket()
+        self._token_validation: Optional[Tuple[bool, float]] = None
 
     def __call__(self, r):
         """
@@ -36,35 +42,56 @@ class GitHubAuthManager(AuthBase):
         """
         Check if the rate limit has been reached and log the error if needed.
 
+        The shared rate limiter's token count is kept in step with the remaining core quota, so
+        once it is spent every caller waits once for the reset rather than running into 403s.
+        Also drops the cached token validation when the API rejects the token.
+
         Args:
             response (requests.Response): The response from the GitHub API.
 
         Raises:
             Exception: If the rate limit has been exceeded.
         """
-        if response.status_code == 403 and 'X-RateLimit-Remaining' in response.headers:
-            reset_time = response.headers.get('X-RateLimit-Reset')
+        if response.status_code == 401:
+            self._token_validation = None
+
+        # GraphQL has its own quota; only the core (REST) quota is tracked by the shared bucket.
+        # Syncing before raising makes requests still queued wait for the reset instead of failing too.
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset_time = response.headers.get('X-RateLimit-Reset')
+        if remaining and reset_time and response.headers.get('X-RateLimit-Resource', 'core') == 'core':
+            self.rate_limiter.set_budget(int(remaining), int(reset_time) - time.time())
+
+        if response.status_code == 403 and remaining is not None:
             if reset_time:
-                reset_time = datetime.datetime.fromtimestamp(int(reset_time)).strftime('%Y-%m-%d %H:%M:%S')
-            logger.error(f"Rate limit exceeded. Reset time: {reset_time}")
+                reset_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(int(reset_time)))
+            logger.error("Rate limit exceeded. Reset time: %s", reset_time)
             raise Exception("GitHub API rate limit exceeded.")
 
     def validate_token(self) -> bool:
         """
         Validate the OAuth token by making a request to the GitHub API.
 
+        A definitive answer from the API is reused for TOKEN_VALIDATION_TTL seconds, or until a
+        request is rejected with a 401.
+
         Returns:
             bool: True if the token is valid, False otherwise.
         """
+        if self._token_validation is not None and time.time() < self._token_validation[1]:
+            return self._token_validation[0]
         try:
-            response = make_request_with_retry('https://api.github.com/user', auth=self)
+            response = make_request_with_retry('https://api.github.com/user', auth=self, rate_limiter=self.rate_limiter)
             self._check_rate_limit(response)
             if response.status_code == 200:
                 logger.info("OAuth token is valid.")
+                self._token_validation = (True, time.time() + self.TOKEN_VALIDATION_TTL)
                 return True
             else:
-                logger.error(f"OAuth token validation failed: {response.status_code} {response.text}")
+                logger.error("OAuth token validation failed: %s %s", response.status_code, response.reason)
+                if response.status_code == 401:
+                    self._token_validation = (False, time.time() + self.TOKEN_VALIDATION_TTL)
                 return False
         except Exception as e:
-            logger.error(f"Error validating OAuth token: {str(e)}")
+            logger.error("Error validating OAuth token: %s", e)
             return False
\ No newline at end of file
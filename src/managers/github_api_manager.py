@@ -2,7 +2,7 @@ import requests
 from typing import Optional
 from ..auth.github_auth import GitHubAuthManager
 from dirmapper_core.utils.logger import logger
-from ..utils.request_utils import make_request_with_retry
+from ..utils.cache import ETagCache
 
 class GitHubAPIManager:
     """
@@ -16,6 +16,7 @@ class GitHubAPIManager:
             auth_manager (GitHubAuthManager): An instance of GitHubAuthManager.
         """
         self.auth_manager = auth_manager
+        self._cache = ETagCache()
 
     def get_user_details(self) -> Optional[dict]:
         """
@@ -25,15 +26,9 @@ class GitHubAPIManager:
             Optional[dict]: The user's details if the token is valid, None otherwise.
         """
         try:
-            response = make_request_with_retry('https://api.github.com/user', auth=self.auth_manager)
-            self.auth_manager._check_rate_limit(response)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to get user details: {response.status_code} {response.text}")
-                return None
+            return self._cache.get_or_fetch('https://api.github.com/user', self.auth_manager)
         except Exception as e:
-            logger.error(f"Error getting user details: {str(e)}")
+            logger.error("Error getting user details: %s", e)
             return None
 
     def get_repository_details(self, owner: str, repo: str) -> Optional[dict]:
@@ -49,13 +44,7 @@ class GitHubAPIManager:
         """
         try:
             url = f'https://api.github.com/repos/{owner}/{repo}'
-            response = make_request_with_retry(url, auth=self.auth_manager)
-            self.auth_manager._check_rate_limit(response)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to get repository details: {response.status_code} {response.text}")
-                return None
+            return self._cache.get_or_fetch(url, self.auth_manager)
         except Exception as e:
-            logger.error(f"Error getting repository details: {str(e)}")
+            logger.error("Error getting repository details: %s", e)
             return None
@@ -1,45 +1,250 @@
-import base64
+import codecs
+import hashlib
+import json
+import os
 import requests
-from typing import Optional, List, Dict
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional, List, Dict, Tuple
 from ..auth.github_auth import GitHubAuthManager
-from ..utils.request_utils import make_request_with_retry
+from ..models.github import ContentEntry, GitTree
+from ..utils.cache import BlobCache, ETagCache
+from ..utils.request_utils import MAX_CONNECTIONS, make_request_with_retry, parse_json
 from dirmapper_core.models.directory_item import DirectoryItem
 from dirmapper_core.models.directory_structure import DirectoryStructure
 from dirmapper_core.utils.logger import logger
 from .repository_manager import RepositoryManager
 
+GRAPHQL_URL = 'https://api.github.com/graphql'
+GRAPHQL_BATCH_SIZE = 100
+RAW_HEADERS = {'Accept': 'application/vnd.github.raw'}
+STREAM_CHUNK_SIZE = 65536
+BINARY_EXTENSIONS = frozenset({'.png', '.jpg', '.gif', '.pdf', '.zip', '.tar', '.gz', '.whl', '.so', '.dll', '.exe', '.bin'})
+
+class RepositoryURLs(NamedTuple):
+    repo: str
+    contents: str
+    trees: str
+    blobs: str
+
+@lru_cache(maxsize=256)
+def _repository_urls(owner: str, repo: str) -> RepositoryURLs:
+    """
+    Build the API base URLs of a repository once, so hot loops only append a path or SHA.
+    """
+    base = f'https://api.github.com/repos/{owner}/{repo}'
+    return RepositoryURLs(repo=base, contents=base + '/contents/', trees=base + '/git/trees/', blobs=base + '/git/blobs/')
+
+def _resolved(value: Any) -> Future:
+    """
+    Wrap a value that is already known in a completed future.
+    """
+    future = Future()
+    future.set_result(value)
+    return future
+
 class GitHubRepositoryManager(RepositoryManager):
-    def __init__(self, auth_manager: GitHubAuthManager):
+    # Git tree entry types mapped to the types used by the contents API
+    _TREE_ENTRY_TYPES = {'blob': 'file', 'tree': 'dir', 'commit': 'submodule'}
+    # Files larger than this many bytes are mapped without their content
+    MAX_FILE_SIZE = 1_000_000
+
+    def __init__(self, auth_manager: GitHubAuthManager, max_workers: int = MAX_CONNECTIONS):
         self.auth_manager = auth_manager
+        self._cache = ETagCache()
+        # Blob contents outlive a walk: they are content-addressed, so later walks reuse them unchecked
+        self._blobs = BlobCache()
+        self.max_workers = max_workers
+
+    def fetch_directory_structure(self, owner: str, repo: str, path: str = "", include_content: bool = True) -> DirectoryStructure:
+        directory_structure = DirectoryStructure()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._fetch_directory_contents(owner, repo, path, directory_structure, executor, include_content)
+        return directory_structure
+
+    def fetch_directory_structure_v2(self, owner: str, repo: str, path: str = "", include_content: bool = False) -> DirectoryStructure:
+        """
+        Fetch the directory structure of a repository from a single recursive Git Trees API call.
+
+        The whole tree is listed in one request instead of one request per directory. Since the
+        tree comes back in depth-first order, items are built in a single pass without recursion.
+        Falls back to fetch_directory_structure when GitHub truncates the tree.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            path (str): The directory to map; defaults to the repository root.
+            include_content (bool): Whether to fetch the content of every file.
 
-    def fetch_directory_structure(self, owner: str, repo: str, path: str = "") -> DirectoryStructure:
+        Returns:
+            DirectoryStructure: The directory structure, empty if the tree could not be fetched.
+        """
         directory_structure = DirectoryStructure()
-        self._fetch_directory_contents(owner, repo, path, directory_structure, level=0)
+        tree = self.get_repository_tree(owner, repo)
+        if tree is None:
+            return directory_structure
+        if tree.truncated:
+            logger.warning("Tree of %s/%s is truncated, falling back to the contents API.", owner, repo)
+            return self.fetch_directory_structure(owner, repo, path, include_content)
+
+        prefix = path.strip('/') + '/' if path.strip('/') else ''
+        base_level = prefix.count('/')
+        entries = [entry for entry in tree.tree if entry.path.startswith(prefix)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Files with identical content share a blob SHA, so each distinct blob is fetched once
+            blobs: Dict[str, Future] = {}
+            pending = []
+            for entry in entries:
+                future = None
+                if include_content and entry.type == 'blob' and self._has_text_content(entry.path, entry.size):
+                    future = blobs.get(entry.sha)
+                    if future is None:
+                        future = blobs[entry.sha] = executor.submit(self._get_blob_content, owner, repo, entry.sha)
+                pending.append(future)
+            for entry, future in zip(entries, pending):
+                item_path = entry.path
+                metadata = {'type': self._TREE_ENTRY_TYPES.get(entry.type, entry.type)}
+                if future is not None:
+                    file_content, content_hash = future.result() or (None, None)
+                    if file_content:
+                        metadata['content'] = file_content
+                        metadata['content_hash'] = content_hash
+
+                directory_structure.add_item(DirectoryItem(path=item_path, level=item_path.count('/') - base_level, name=item_path.rsplit('/', 1)[-1], metadata=metadata))
         return directory_structure
 
-    def _fetch_directory_contents(self, owner: str, repo: str, path: str, directory_structure: DirectoryStructure, level: int):
-        contents = self.get_repository_contents(owner, repo, path)
-        if contents is None:
-            return
+    def _fetch_directory_contents(self, owner: str, repo: str, path: str, directory_structure: DirectoryStructure, executor: ThreadPoolExecutor, include_content: bool = True):
+        """
+        Add every item under a directory to the structure, in depth-first order.
+
+        All listings and file contents are fetched first by _fetch_listings, then the items are
+        assembled from an explicit stack: when a subdirectory is reached its items are pushed on
+        top, so they come out in the order of a recursive walk without its call overhead or
+        recursion limit. Only this thread adds items, so the structure needs no lock.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            path (str): The path to the directory within the repository.
+            directory_structure (DirectoryStructure): The structure to add the items to.
+            executor (ThreadPoolExecutor): The pool running the API requests.
+            include_content (bool): Whether to fetch the content of every file.
+        """
+        listings, blobs = self._fetch_listings(owner, repo, path, executor, include_content)
+        stack = deque([(deque(listings.get(path) or ()), 0)])
+        while stack:
+            items, level = stack[-1]
+            if not items:
+                stack.pop()
+                continue
 
-        for item in contents:
-            item_path = item['path']
-            item_name = item['name']
-            item_type = item['type']
-            directory_item = DirectoryItem(path=item_path, level=level, name=item_name, metadata={'type': item_type})
+            item = items.popleft()
+            item_path = item.path
+            item_name = item.name
+            item_type = item.type
 
-            if item_type == 'file':
-                file_content = self._get_file_content(owner, repo, item_path)
+            # Build the metadata in full first, so each item is constructed once and never patched
+            metadata = {'type': item_type}
+            if item_type == 'file' and include_content and self._has_text_content(item.path, item.size, item.encoding):
+                file_content, content_hash = blobs[item.sha or item.path].result() or (None, None)
                 if file_content:
-                    directory_item.metadata['content'] = file_content
-                    directory_item.metadata['content_hash'] = directory_item._hash_content(file_content)
+                    metadata['content'] = file_content
+                    # The listing's blob SHA already identifies the content, no need to hash it again
+                    metadata['content_hash'] = item.sha or content_hash or hashlib.blake2b(file_content.encode('utf-8'), digest_size=16).hexdigest()
 
-            directory_structure.add_item(directory_item)
+            directory_structure.add_item(DirectoryItem(path=item_path, level=level, name=item_name, metadata=metadata))
 
             if item_type == 'dir':
-                self._fetch_directory_contents(owner, repo, item_path, directory_structure, level + 1)
+                stack.append((deque(listings.get(item_path) or ()), level + 1))
+
+    def _fetch_listings(self, owner: str, repo: str, path: str, executor: ThreadPoolExecutor, include_content: bool = True) -> Tuple[Dict[str, Optional[List[ContentEntry]]], Dict[str, Future]]:
+        """
+        Fetch the listing of every directory under a path, and the contents of its files.
+
+        As soon as a listing arrives, the listings of its subdirectories and one GraphQL batch for
+        its files are submitted, without waiting on anything else. Every known directory is thus
+        in flight at once and wall time follows the depth of the tree, not the number of
+        directories. Files whose blob SHA was already seen, in this walk or in the blob cache, reuse
+        that content and are left out of the batch; files the batch could not serve are fetched
+        from the REST API.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            path (str): The path to the directory within the repository.
+            executor (ThreadPoolExecutor): The pool running the API requests.
+            include_content (bool): Whether to fetch the content of files; without it only listings are fetched.
+
+        Returns:
+            Tuple[Dict[str, Optional[List[ContentEntry]]], Dict[str, Future]]: The listing of each directory, keyed by path,
+                and a future of the (content, hash) of each file, keyed by blob SHA (or path, for entries without one).
+        """
+        listings = {}
+        blobs: Dict[str, Future] = {}
+        # Keys of files already handed to a batch, whose future is only known once the batch is back
+        batched = set()
+        pending = {executor.submit(self.get_repository_contents, owner, repo, path): (path, None)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                listing_path, batch_files = pending.pop(future)
+                if batch_files is None:
+                    contents = listings[listing_path] = future.result()
+                    new_files = {}
+                    for item in contents or ():
+                        if item.type == 'dir':
+                            pending[executor.submit(self.get_repository_contents, owner, repo, item.path)] = (item.path, None)
+                        elif include_content and item.type == 'file' and self._has_text_content(item.path, item.size, item.encoding):
+                            key = item.sha or item.path
+                            if key in blobs or key in batched:
+                                continue
+                            cached = self._blobs.get(item.sha) if item.sha else None
+                            if cached is not None:
+                                blobs[key] = _resolved(cached)
+                            else:
+                                batched.add(key)
+                                new_files[key] = item
+                    if new_files:
+                        file_paths = [item.path for item in new_files.values()]
+                        pending[executor.submit(self._get_file_contents_batch, owner, repo, file_paths)] = (listing_path, new_files)
+                else:
+                    file_contents = future.result()
+                    for key, item in batch_files.items():
+                        if item.path in file_contents:
+                            if item.sha:
+                                self._blobs.put(item.sha, file_contents[item.path], item.sha)
+                            blobs[key] = _resolved((file_contents[item.path], item.sha or None))
+                        elif item.sha:
+                            # Blobs the batch could not serve (truncated, failed query) go through the REST API
+                            blobs[key] = executor.submit(self._get_blob_content, owner, repo, item.sha)
+                        else:
+                            blobs[key] = executor.submit(self._get_file_content, owner, repo, item.path)
+        return listings, blobs
+
+    def _has_text_content(self, path: str, size: int, encoding: Optional[str] = None) -> bool:
+        """
+        Tell from a listing or tree entry alone whether the file's content is worth fetching.
+
+        Files larger than MAX_FILE_SIZE, files with a known binary extension and entries with a
+        non-base64 encoding are skipped; they are still mapped, only without content.
+
+        Args:
+            path (str): The path of the file.
+            size (int): The size of the file in bytes.
+            encoding (Optional[str]): The encoding of the entry, if the listing gave one.
+
+        Returns:
+            bool: True if the content should be fetched, False otherwise.
+        """
+        if size > self.MAX_FILE_SIZE:
+            return False
+        if encoding not in (None, 'base64'):
+            return False
+        return os.path.splitext(path)[1].lower() not in BINARY_EXTENSIONS
 
-    def get_repository_contents(self, owner: str, repo: str, path: str = "") -> Optional[List[Dict]]:
+    def get_repository_contents(self, owner: str, repo: str, path: str = "") -> Optional[List[ContentEntry]]:
         """
         Get the contents of a repository or a specific directory from the GitHub API.
 
@@ -49,22 +254,85 @@ class GitHubRepositoryManager(RepositoryManager):
             path (str): The path to the directory or file within the repository.
 
         Returns:
-            Optional[List[Dict]]: The contents of the repository or directory if the request is successful, None otherwise.
+            Optional[List[ContentEntry]]: The entries of the directory if the request is successful, None otherwise.
         """
         try:
-            url = f'https://api.github.com/repos/{owner}/{repo}/contents/{path}'
-            response = make_request_with_retry(url, auth=self.auth_manager)
-            self.auth_manager._check_rate_limit(response)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to get repository contents: {response.status_code} {response.text}")
-                return None
+            url = _repository_urls(owner, repo).contents + path
+            return self._cache.get_or_fetch(url, self.auth_manager, type=List[ContentEntry])
         except Exception as e:
-            logger.error(f"Error getting repository contents: {str(e)}")
+            logger.error("Error getting repository contents: %s", e)
             return None
 
-    def _get_file_content(self, owner: str, repo: str, path: str) -> Optional[str]:
+    def get_repository_tree(self, owner: str, repo: str, ref: Optional[str] = None) -> Optional[GitTree]:
+        """
+        Get the full recursive tree of a repository from the Git Trees API.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            ref (Optional[str]): The branch, tag or tree SHA to list. Defaults to the default branch.
+
+        Returns:
+            Optional[GitTree]: The tree, with a flat list of entries and a truncated flag, if the request is successful, None otherwise.
+        """
+        try:
+            urls = _repository_urls(owner, repo)
+            if ref is None:
+                ref = self._cache.get_or_fetch(urls.repo, self.auth_manager)['default_branch']
+            url = urls.trees + ref + '?recursive=1'
+            return self._cache.get_or_fetch(url, self.auth_manager, type=GitTree)
+        except Exception as e:
+            logger.error("Error getting repository tree: %s", e)
+            return None
+
+    def _get_file_contents_batch(self, owner: str, repo: str, paths: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Get the contents of many files at once from the GitHub GraphQL API.
+
+        Each request asks for up to GRAPHQL_BATCH_SIZE files as aliased object fields, instead of
+        one REST call per file.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            paths (List[str]): The paths of the files within the repository.
+
+        Returns:
+            Dict[str, Optional[str]]: The content of each file the batch resolved, None for binary files.
+                Paths whose content was truncated, or that the query could not resolve, are left out.
+        """
+        file_contents = {}
+        try:
+            for start in range(0, len(paths), GRAPHQL_BATCH_SIZE):
+                batch = paths[start:start + GRAPHQL_BATCH_SIZE]
+                fields = ' '.join(
+                    f'f{i}: object(expression: {json.dumps("HEAD:" + path)}) {{ ... on Blob {{ text isBinary isTruncated }} }}'
+                    for i, path in enumerate(batch)
+                )
+                query = f'query {{ repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ {fields} }} }}'
+                response = make_request_with_retry(GRAPHQL_URL, method='POST', auth=self.auth_manager, rate_limiter=self.auth_manager.rate_limiter, json={'query': query})
+                self.auth_manager._check_rate_limit(response)
+                response.raise_for_status()
+                payload = parse_json(response)
+                if payload.get('errors'):
+                    logger.error("GraphQL errors getting file contents: %s", payload['errors'])
+                repository = (payload.get('data') or {}).get('repository')
+                if not repository:
+                    # The whole query failed (unknown repository, no GraphQL access); let every path fall back
+                    continue
+                for i, path in enumerate(batch):
+                    blob = repository.get(f'f{i}')
+                    if not blob:
+                        continue
+                    if blob.get('isBinary'):
+                        file_contents[path] = None
+                    elif not blob.get('isTruncated') and blob.get('text') is not None:
+                        file_contents[path] = blob['text']
+        except Exception as e:
+            logger.error("Error getting file contents: %s", e)
+        return file_contents
+
+    def _get_file_content(self, owner: str, repo: str, path: str) -> Optional[Tuple[str, str]]:
         """
         Get the content of a file from the GitHub API.
 
@@ -74,22 +342,65 @@ class GitHubRepositoryManager(RepositoryManager):
             path (str): The path to the file within the repository.
 
         Returns:
-            Optional[str]: The content of the file if the request is successful, None otherwise.
+            Optional[Tuple[str, str]]: The content of the file and a BLAKE2b digest of its raw bytes if the request is successful, None otherwise.
         """
         try:
-            url = f'https://api.github.com/repos/{owner}/{repo}/contents/{path}'
-            response = make_request_with_retry(url, auth=self.auth_manager)
-            self.auth_manager._check_rate_limit(response)
-            if response.status_code == 200:
-                content = response.json().get('content')
-                if content:
-                    return base64.b64decode(content).decode('utf-8')
-                else:
-                    logger.error("File content is empty.")
-                    return None
-            else:
-                logger.error(f"Failed to get file content: {response.status_code} {response.text}")
-                return None
+            return self._stream_content(_repository_urls(owner, repo).contents + path)
         except Exception as e:
-            logger.error(f"Error getting file content: {str(e)}")
+            logger.error("Error getting file content: %s", e)
             return None
+
+    def _get_blob_content(self, owner: str, repo: str, sha: str) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Get the content of a file from the blob cache, or else from the Git Blobs API.
+
+        Args:
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            sha (str): The SHA of the blob.
+
+        Returns:
+            Optional[Tuple[Optional[str], str]]: The content of the file (None for a binary file) and its blob SHA
+                if the request is successful, None otherwise.
+        """
+        cached = self._blobs.get(sha)
+        if cached is not None:
+            return cached
+        try:
+            content, _ = self._stream_content(_repository_urls(owner, repo).blobs + sha, hash_content=False)
+            self._blobs.put(sha, content, sha)
+            return content, sha
+        except Exception as e:
+            logger.error("Error getting blob content: %s", e)
+            return None
+
+    def _stream_content(self, url: str, hash_content: bool = True) -> Tuple[str, Optional[str]]:
+        """
+        Download a file as raw bytes, decoding and hashing it one chunk at a time.
+
+        Asking for the raw media type skips the base64 JSON envelope, and streaming keeps a
+        single chunk of the body in flight instead of the encoded, decoded and text copies.
+
+        Args:
+            url (str): The contents or blob URL of the file.
+            hash_content (bool): Whether to compute a BLAKE2b digest of the raw bytes.
+
+        Returns:
+            Tuple[str, Optional[str]]: The content of the file, decoded as UTF-8, and its digest if requested.
+
+        Raises:
+            requests.HTTPError: If the API answers with an error status.
+        """
+        response = make_request_with_retry(url, auth=self.auth_manager, rate_limiter=self.auth_manager.rate_limiter, headers=RAW_HEADERS, stream=True)
+        with response:
+            self.auth_manager._check_rate_limit(response)
+            response.raise_for_status()
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            digest = hashlib.blake2b(digest_size=16) if hash_content else None
+            parts = []
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                if digest is not None:
+                    digest.update(chunk)
+                parts.append(decoder.decode(chunk))
+            parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts), digest.hexdigest() if digest is not None else None
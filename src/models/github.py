@@ -0,0 +1,31 @@
+import msgspec
+from typing import List, Optional
+
+class ContentEntry(msgspec.Struct, frozen=True):
+    """
+    ContentEntry is one item of a directory listing from the GitHub contents API.
+    """
+    path: str
+    name: str
+    type: str
+    size: int = 0
+    sha: str = ''
+    encoding: Optional[str] = None
+    content: Optional[str] = None
+
+class TreeEntry(msgspec.Struct, frozen=True):
+    """
+    TreeEntry is one item of a recursive tree from the Git Trees API.
+    """
+    path: str
+    type: str
+    sha: str = ''
+    size: int = 0
+
+class GitTree(msgspec.Struct, frozen=True):
+    """
+    GitTree is a tree response from the Git Trees API.
+    """
+    tree: List[TreeEntry]
+    sha: str = ''
+    truncated: bool = False
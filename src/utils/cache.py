@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from ..auth.github_auth import GitHubAuthManager
+from .request_utils import make_request_with_retry, parse_json
+
+LISTING_TTL = 60
+
+class ETagCache:
+    """
+    ETagCache keeps the JSON bodies of GitHub API responses and revalidates them with their ETag.
+
+    A body is served from memory until its TTL expires. After that the stored ETag is sent as
+    If-None-Match, and a 304 reply (which GitHub does not count against the rate limit) renews
+    the entry without transferring the body again.
+    """
+    def __init__(self, default_ttl: float = LISTING_TTL, maxsize: int = 1024):
+        """
+        Initialize the ETagCache.
+
+        Args:
+            default_ttl (float): Seconds a body is served without revalidation.
+            maxsize (int): The maximum number of URLs kept; the oldest entries are evicted first.
+        """
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self._entries: Dict[str, Tuple[Optional[str], Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, url: str, auth: GitHubAuthManager, ttl: Optional[float] = None, type: Optional[Any] = None) -> Any:
+        """
+        Get the decoded JSON body of a URL, from memory when possible.
+
+        Args:
+            url (str): The URL to fetch.
+            auth (GitHubAuthManager): The auth manager used to sign the request.
+            ttl (Optional[float]): Seconds to serve the body without revalidation. Defaults to default_ttl.
+            type (Optional[Any]): The type to decode the body into; see parse_json.
+
+        Returns:
+            Any: The decoded body.
+
+        Raises:
+            requests.HTTPError: If the API answers with an error status.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry and time.time() < entry[2]:
+            return entry[1]
+
+        headers = {'If-None-Match': entry[0]} if entry and entry[0] else None
+        response = make_request_with_retry(url, auth=auth, headers=headers, rate_limiter=auth.rate_limiter)
+        auth._check_rate_limit(response)
+        if response.status_code == 304 and entry:
+            etag, body = entry[0], entry[1]
+        else:
+            response.raise_for_status()
+            etag, body = response.headers.get('ETag'), parse_json(response, type)
+
+        with self._lock:
+            self._entries.pop(url, None)
+            self._entries[url] = (etag, body, time.time() + (self.default_ttl if ttl is None else ttl))
+            while len(self._entries) > self.maxsize:
+                del self._entries[next(iter(self._entries))]
+        return body
+
+# Characters of file content kept by a BlobCache, about 64 MB of ASCII text
+BLOB_CACHE_CHARS = 64 * 1024 * 1024
+
+class BlobCache:
+    """
+    BlobCache keeps the contents of files across walks, keyed by their blob SHA.
+
+    A blob SHA names its content, so entries never go stale and need no revalidation. The least
+    recently used entries are evicted once the cached text exceeds max_chars characters.
+    """
+    def __init__(self, max_chars: int = BLOB_CACHE_CHARS):
+        """
+        Initialize the BlobCache.
+
+        Args:
+            max_chars (int): The most characters of content kept in total.
+        """
+        self.max_chars = max_chars
+        self._chars = 0
+        self._entries: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, sha: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """
+        Get the (content, hash) stored for a blob.
+
+        Args:
+            sha (str): The SHA of the blob.
+
+        Returns:
+            Optional[Tuple[Optional[str], Optional[str]]]: The content and hash of the blob, or None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.pop(sha, None)
+            if entry is not None:
+                self._entries[sha] = entry
+            return entry
+
+    def put(self, sha: str, content: Optional[str], content_hash: Optional[str]) -> None:
+        """
+        Store the content of a blob; content is None for binary files.
+
+        Args:
+            sha (str): The SHA of the blob.
+            content (Optional[str]): The content of the file.
+            content_hash (Optional[str]): The hash of the content.
+        """
+        chars = len(content or '')
+        if chars > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(sha, None)
+            if previous is not None:
+                self._chars -= len(previous[0] or '')
+            self._entries[sha] = (content, content_hash)
+            self._chars += chars
+            while self._chars > self.max_chars:
+                evicted = self._entries.pop(next(iter(self._entries)))
+                self._chars -= len(evicted[0] or '')
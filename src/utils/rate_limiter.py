@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Optional
+
+# GitHub's primary rate limit for an authenticated token: 5000 requests per hour
+GITHUB_QUOTA = 5000
+GITHUB_QUOTA_WINDOW = 3600
+
+class TokenBucket:
+    """
+    TokenBucket holds the API quota left to a token and paces requests only when needed.
+
+    Every request spends one token, and the tokens are the requests the API still allows in the
+    current window, so callers may spend the whole remaining quota as fast as they go. set_budget
+    keeps the count in step with the API. Once the tokens run out, callers wait for the window to
+    reset and the bucket fills up again.
+
+    When the API pushes back regardless (secondary rate limits), requests are spaced out at a
+    rate that is halved on every pushback and grows additively while requests succeed, until it
+    reaches max_rate and pacing is lifted again.
+    """
+    def __init__(self, capacity: int = GITHUB_QUOTA, window: float = GITHUB_QUOTA_WINDOW, min_rate: float = 0.5, max_rate: float = 50.0):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            capacity (int): The requests allowed per window; defaults to GitHub's 5000 per hour.
+            window (float): The length of a quota window in seconds, used until the API reports a reset time.
+            min_rate (float): The slowest pace, in requests per second, that pushback can bring requests down to.
+            max_rate (float): The pace, in requests per second, at which pacing is lifted again.
+        """
+        self.capacity = capacity
+        self.window = window
+        self.tokens = float(capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        # None while requests are not paced
+        self.rate: Optional[float] = None
+        self.reset_at: Optional[float] = None
+        self._next_request = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_time(self, now: float) -> float:
+        if self.reset_at is not None and now >= self.reset_at:
+            self.tokens = float(self.capacity)
+            self.reset_at = None
+        if self.tokens < 1:
+            if self.reset_at is None:
+                self.reset_at = now + self.window
+            return self.reset_at - now
+        if self.rate is not None:
+            return self._next_request - now
+        return 0.0
+
+    def acquire(self) -> None:
+        """
+        Take one token, sleeping while the quota is spent or requests are paced.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait <= 0:
+                    self.tokens -= 1
+                    if self.rate is not None:
+                        self._next_request = now + 1 / self.rate
+                    return
+            time.sleep(wait)
+
+    def increase_rate(self, delta: float = 1.0) -> None:
+        """
+        Raise the pace after a successful request, lifting it once it reaches max_rate.
+
+        Args:
+            delta (float): The amount to add, in requests per second.
+        """
+        with self._lock:
+            if self.rate is None:
+                return
+            self.rate += delta
+            if self.rate >= self.max_rate:
+                self.rate = None
+
+    def decrease_rate(self) -> None:
+        """
+        Halve the pace after the API signalled a rate limit, starting from max_rate.
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, (self.max_rate if self.rate is None else self.rate) / 2)
+
+    def set_budget(self, remaining: int, window: float) -> None:
+        """
+        Bring the token count in line with the quota the API reports.
+
+        Args:
+            remaining (int): The requests left in the current window (X-RateLimit-Remaining).
+            window (float): Seconds until the window resets (X-RateLimit-Reset minus now).
+        """
+        with self._lock:
+            reset_at = time.monotonic() + max(window, 0.0)
+            if self.reset_at is None or reset_at > self.reset_at + 1:
+                # A new window; the API's count replaces the local one
+                self.tokens = float(remaining)
+            else:
+                # Requests still in flight are not counted by the API yet, so keep the lower count
+                self.tokens = min(self.tokens, float(remaining))
+            self.reset_at = reset_at
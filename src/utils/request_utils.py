@@ -0,0 +1,75 @@
+import msgspec
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Optional
+from urllib3.util.retry import Retry
+from .rate_limiter import TokenBucket
+
+# The most connections kept open to the API; also the default number of concurrent workers
+MAX_CONNECTIONS = 16
+
+# Retries run inside the connection pool; raise_on_status=False hands the last response back once they are exhausted
+_RETRY = Retry(total=3, backoff_factor=2, status_forcelist=[502, 503, 504, 429], respect_retry_after_header=True, allowed_methods=['GET'], raise_on_status=False)
+
+# One keep-alive connection pool shared by every request, so TLS handshakes are paid once per connection.
+# pool_block makes extra threads wait for a pooled connection rather than open one that is discarded after use.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=MAX_CONNECTIONS, pool_block=True, max_retries=_RETRY))
+_SESSION.headers.update({'Accept': 'application/vnd.github+json', 'Accept-Encoding': 'gzip'})
+
+def parse_json(response: requests.Response, type: Optional[Any] = None) -> Any:
+    """
+    Decode a JSON response body.
+
+    Untyped bodies are decoded with orjson, which is much faster than response.json() on large
+    payloads. With a type, msgspec decodes and validates straight into that type.
+
+    Args:
+        response (requests.Response): The response to decode.
+        type (Optional[Any]): The type to decode into, e.g. List[ContentEntry].
+
+    Returns:
+        Any: The decoded body.
+    """
+    if type is not None:
+        return msgspec.json.decode(response.content, type=type)
+    return orjson.loads(response.content)
+
+def _is_rate_limited(response: requests.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        'Retry-After' in response.headers or response.headers.get('X-RateLimit-Remaining') == '0'
+    )
+
+def make_request_with_retry(url: str, method: str = 'GET', rate_limiter: Optional[TokenBucket] = None, **kwargs) -> requests.Response:
+    """
+    Make an HTTP request through the shared session.
+
+    Transient failures (connection errors, and 429 or 502-504 answers to GET requests) are retried
+    inside the session's connection pool by urllib3, with exponential backoff and honouring
+    Retry-After. When a rate limiter is given, a token is taken before the request and the
+    limiter's rate is adjusted from the final response.
+
+    Args:
+        url (str): The URL to request.
+        method (str): The HTTP method to use.
+        rate_limiter (Optional[TokenBucket]): The bucket shared by every caller using the same token.
+        **kwargs: Extra keyword arguments passed to Session.request (e.g. auth, headers, json).
+
+    Returns:
+        requests.Response: The final response.
+
+    Raises:
+        requests.RequestException: If no response could be received after all retries.
+    """
+    if rate_limiter:
+        rate_limiter.acquire()
+    response = _SESSION.request(method, url, **kwargs)
+    if rate_limiter:
+        if _is_rate_limited(response):
+            rate_limiter.decrease_rate()
+        elif response.ok:
+            rate_limiter.increase_rate()
+    return response
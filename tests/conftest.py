@@ -0,0 +1,22 @@
+import orjson
+import pytest
+import requests
+
+
+def _make_response(status_code, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if body is None:
+        response._content = b''
+    elif isinstance(body, bytes):
+        response._content = body
+    else:
+        response._content = orjson.dumps(body)
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def make_response():
+    """Build a requests.Response with a body (bytes, or a payload encoded as JSON) and headers."""
+    return _make_response
@@ -0,0 +1,106 @@
+import pytest
+import requests
+from src.utils import cache as cache_module
+from src.utils.cache import BlobCache, ETagCache
+from src.utils.rate_limiter import TokenBucket
+
+
+class FakeAuth:
+    def __init__(self):
+        self.rate_limiter = TokenBucket()
+
+    def _check_rate_limit(self, response):
+        pass
+
+
+class FakeSession:
+    """Stands in for make_request_with_retry: records each request and answers from a queue."""
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+
+    def __call__(self, url, **kwargs):
+        self.requests.append((url, kwargs.get('headers')))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(cache_module, 'make_request_with_retry', session)
+    return session
+
+
+def test_fresh_entry_is_served_without_a_request(session, make_response):
+    cache = ETagCache()
+    session.responses.append(make_response(200, b'{"name": "repo"}', {'ETag': '"v1"'}))
+
+    assert cache.get_or_fetch('https://api.test/a', FakeAuth()) == {'name': 'repo'}
+    assert cache.get_or_fetch('https://api.test/a', FakeAuth()) == {'name': 'repo'}
+    assert len(session.requests) == 1
+
+
+def test_expired_entry_is_revalidated_with_its_etag(session, make_response):
+    cache = ETagCache(default_ttl=0)
+    session.responses.append(make_response(200, b'[1, 2]', {'ETag': '"v1"'}))
+    session.responses.append(make_response(304))
+
+    first = cache.get_or_fetch('https://api.test/a', FakeAuth())
+    second = cache.get_or_fetch('https://api.test/a', FakeAuth())
+
+    assert second is first
+    assert session.requests[0][1] is None
+    assert session.requests[1][1] == {'If-None-Match': '"v1"'}
+
+
+def test_changed_body_replaces_the_entry(session, make_response):
+    cache = ETagCache(default_ttl=0)
+    session.responses.append(make_response(200, b'[1]', {'ETag': '"v1"'}))
+    session.responses.append(make_response(200, b'[2]', {'ETag': '"v2"'}))
+    session.responses.append(make_response(304))
+
+    assert cache.get_or_fetch('https://api.test/a', FakeAuth()) == [1]
+    assert cache.get_or_fetch('https://api.test/a', FakeAuth()) == [2]
+    assert cache.get_or_fetch('https://api.test/a', FakeAuth()) == [2]
+    assert session.requests[2][1] == {'If-None-Match': '"v2"'}
+
+
+def test_error_status_raises_and_is_not_cached(session, make_response):
+    cache = ETagCache()
+    session.responses.append(make_response(404, b'{"message": "Not Found"}'))
+    session.responses.append(make_response(200, b'[]'))
+
+    with pytest.raises(requests.HTTPError):
+        cache.get_or_fetch('https://api.test/a', FakeAuth())
+    assert cache.get_or_fetch('https://api.test/a', FakeAuth()) == []
+
+
+def test_oldest_entry_is_evicted_past_maxsize(session, make_response):
+    cache = ETagCache(maxsize=2)
+    for body in (b'"a"', b'"b"', b'"c"', b'"a"'):
+        session.responses.append(make_response(200, body))
+
+    for url in ('https://api.test/a', 'https://api.test/b', 'https://api.test/c'):
+        cache.get_or_fetch(url, FakeAuth())
+    assert list(cache._entries) == ['https://api.test/b', 'https://api.test/c']
+
+    cache.get_or_fetch('https://api.test/a', FakeAuth())
+    assert len(session.requests) == 4
+    assert list(cache._entries) == ['https://api.test/c', 'https://api.test/a']
+
+
+def test_blob_cache_evicts_least_recently_used_content():
+    blobs = BlobCache(max_chars=10)
+    blobs.put('a', 'aaaa', 'a')
+    blobs.put('b', 'bbbb', 'b')
+    blobs.put('bin', None, 'bin')
+    assert blobs.get('a') == ('aaaa', 'a')
+
+    blobs.put('c', 'cccc', 'c')
+    assert blobs.get('b') is None
+    assert blobs.get('a') == ('aaaa', 'a')
+    assert blobs.get('bin') == (None, 'bin')
+
+    blobs.put('huge', 'x' * 11, 'huge')
+    assert blobs.get('huge') is None
+    assert blobs.get('c') == ('cccc', 'c')
@@ -0,0 +1,97 @@
+import time
+import pytest
+from src.auth import github_auth as auth_module
+from src.auth.github_auth import GitHubAuthManager
+from src.utils.rate_limiter import GITHUB_QUOTA
+
+
+def test_remaining_core_quota_sets_the_shared_bucket(make_response):
+    auth = GitHubAuthManager('token')
+    reset = str(int(time.time()) + 1000)
+    auth._check_rate_limit(make_response(200, headers={'X-RateLimit-Remaining': '100', 'X-RateLimit-Reset': reset, 'X-RateLimit-Resource': 'core'}))
+
+    assert auth.rate_limiter.tokens == 100
+    assert auth.rate_limiter.rate is None
+
+
+def test_graphql_quota_leaves_the_bucket_alone(make_response):
+    auth = GitHubAuthManager('token')
+    reset = str(int(time.time()) + 1000)
+    auth._check_rate_limit(make_response(200, headers={'X-RateLimit-Remaining': '1', 'X-RateLimit-Reset': reset, 'X-RateLimit-Resource': 'graphql'}))
+
+    assert auth.rate_limiter.tokens == GITHUB_QUOTA
+
+
+def test_exhausted_quota_raises_and_empties_the_bucket(make_response):
+    auth = GitHubAuthManager('token')
+    reset = str(int(time.time()) + 1000)
+    with pytest.raises(Exception, match='rate limit exceeded'):
+        auth._check_rate_limit(make_response(403, headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}))
+
+    assert auth.rate_limiter.tokens == 0
+    assert auth.rate_limiter.reset_at - time.monotonic() == pytest.approx(1000, abs=2)
+
+
+class FakeUserEndpoint:
+    """Stands in for make_request_with_retry: answers every request with the next status code."""
+    def __init__(self, make_response, *status_codes):
+        self.make_response = make_response
+        self.status_codes = list(status_codes)
+        self.requests = 0
+
+    def __call__(self, url, **kwargs):
+        self.requests += 1
+        return self.make_response(self.status_codes.pop(0))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(auth_module.time, 'time', lambda: now[0])
+    return now
+
+
+def test_valid_token_is_reused_until_the_ttl_expires(monkeypatch, make_response, clock):
+    endpoint = FakeUserEndpoint(make_response, 200, 200)
+    monkeypatch.setattr(auth_module, 'make_request_with_retry', endpoint)
+    auth = GitHubAuthManager('token')
+
+    assert auth.validate_token()
+    clock[0] += GitHubAuthManager.TOKEN_VALIDATION_TTL - 1
+    assert auth.validate_token()
+    assert endpoint.requests == 1
+
+    clock[0] += 2
+    assert auth.validate_token()
+    assert endpoint.requests == 2
+
+
+def test_rejected_token_is_remembered(monkeypatch, make_response, clock):
+    endpoint = FakeUserEndpoint(make_response, 401)
+    monkeypatch.setattr(auth_module, 'make_request_with_retry', endpoint)
+    auth = GitHubAuthManager('token')
+
+    assert not auth.validate_token()
+    assert not auth.validate_token()
+    assert endpoint.requests == 1
+
+
+def test_server_errors_are_not_remembered(monkeypatch, make_response, clock):
+    endpoint = FakeUserEndpoint(make_response, 500, 200)
+    monkeypatch.setattr(auth_module, 'make_request_with_retry', endpoint)
+    auth = GitHubAuthManager('token')
+
+    assert not auth.validate_token()
+    assert auth.validate_token()
+    assert endpoint.requests == 2
+
+
+def test_a_later_401_drops_the_cached_validation(monkeypatch, make_response, clock):
+    endpoint = FakeUserEndpoint(make_response, 200, 401)
+    monkeypatch.setattr(auth_module, 'make_request_with_retry', endpoint)
+    auth = GitHubAuthManager('token')
+
+    assert auth.validate_token()
+    auth._check_rate_limit(make_response(401))
+    assert not auth.validate_token()
+    assert endpoint.requests == 2
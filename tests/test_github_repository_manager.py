@@ -0,0 +1,249 @@
+import hashlib
+import pytest
+from src.auth.github_auth import GitHubAuthManager
+from src.managers import github_repository_manager as manager_module
+from src.managers.github_repository_manager import GitHubRepositoryManager
+from src.models.github import ContentEntry, GitTree, TreeEntry
+
+
+@pytest.fixture
+def manager():
+    return GitHubRepositoryManager(GitHubAuthManager('token'), max_workers=4)
+
+
+@pytest.mark.parametrize('path, size, encoding, expected', [
+    ('src/main.py', 120, 'base64', True),
+    ('README', 0, None, True),
+    ('docs/logo.PNG', 120, 'base64', False),
+    ('dist/pkg.whl', 120, None, False),
+    ('data/big.csv', GitHubRepositoryManager.MAX_FILE_SIZE + 1, 'base64', False),
+    ('data/huge.csv', 0, 'none', False),
+])
+def test_has_text_content(manager, path, size, encoding, expected):
+    assert manager._has_text_content(path, size, encoding) is expected
+
+
+def test_batch_keeps_text_marks_binary_and_skips_truncated(manager, monkeypatch, make_response):
+    payload = {'data': {'repository': {
+        'f0': {'text': 'print(1)\n', 'isBinary': False, 'isTruncated': False},
+        'f1': {'text': None, 'isBinary': True, 'isTruncated': False},
+        'f2': {'text': 'partial', 'isBinary': False, 'isTruncated': True},
+        'f3': None,
+    }}}
+    monkeypatch.setattr(manager_module, 'make_request_with_retry', lambda url, **kwargs: make_response(200, payload))
+
+    contents = manager._get_file_contents_batch('owner', 'repo', ['a.py', 'b.dat', 'c.txt', 'gone.txt'])
+
+    assert contents == {'a.py': 'print(1)\n', 'b.dat': None}
+
+
+def test_failed_query_leaves_every_path_to_the_fallback(manager, monkeypatch, make_response):
+    payload = {'errors': [{'message': 'Could not resolve to a Repository'}], 'data': {'repository': None}}
+    monkeypatch.setattr(manager_module, 'make_request_with_retry', lambda url, **kwargs: make_response(200, payload))
+
+    assert manager._get_file_contents_batch('owner', 'repo', ['a.py', 'b.py']) == {}
+
+
+def test_walk_fetches_files_the_batch_could_not_serve_over_rest(manager, monkeypatch, make_response):
+    listings = {
+        '': [
+            ContentEntry(path='a.py', name='a.py', type='file', size=3, sha='sha-a'),
+            ContentEntry(path='sub', name='sub', type='dir'),
+        ],
+        'sub': [ContentEntry(path='sub/b.py', name='b.py', type='file', size=3, sha='sha-b')],
+    }
+    payload = {'errors': [{'message': 'GraphQL is unavailable'}], 'data': {'repository': None}}
+    blob_requests = []
+
+    def get_blob_content(owner, repo, sha):
+        blob_requests.append(sha)
+        return 'content of ' + sha, sha
+
+    monkeypatch.setattr(manager_module, 'make_request_with_retry', lambda url, **kwargs: make_response(200, payload))
+    monkeypatch.setattr(manager, 'get_repository_contents', lambda owner, repo, path='': listings.get(path))
+    monkeypatch.setattr(manager, '_get_blob_content', get_blob_content)
+
+    structure = manager.fetch_directory_structure('owner', 'repo')
+
+    assert [(item.path, item.level) for item in structure.items] == [('a.py', 0), ('sub', 0), ('sub/b.py', 1)]
+    assert structure.items[0].metadata['content'] == 'content of sha-a'
+    assert structure.items[0].metadata['content_hash'] == 'sha-a'
+    assert structure.items[2].metadata['content'] == 'content of sha-b'
+    assert sorted(blob_requests) == ['sha-a', 'sha-b']
+
+
+def test_files_sharing_a_blob_are_fetched_once(manager, monkeypatch):
+    listings = {
+        '': [
+            ContentEntry(path='a.py', name='a.py', type='file', size=3, sha='shared'),
+            ContentEntry(path='sub', name='sub', type='dir'),
+        ],
+        'sub': [ContentEntry(path='sub/copy.py', name='copy.py', type='file', size=3, sha='shared')],
+    }
+    batches = []
+
+    def get_file_contents_batch(owner, repo, paths):
+        batches.append(paths)
+        return {path: 'same content' for path in paths}
+
+    monkeypatch.setattr(manager, 'get_repository_contents', lambda owner, repo, path='': listings.get(path))
+    monkeypatch.setattr(manager, '_get_file_contents_batch', get_file_contents_batch)
+
+    structure = manager.fetch_directory_structure('owner', 'repo')
+
+    assert sum(batches, []) == ['a.py']
+    assert structure.items[0].metadata['content'] == 'same content'
+    assert structure.items[2].metadata['content'] == 'same content'
+    assert structure.items[2].metadata['content_hash'] == 'shared'
+
+
+def test_tree_walk_fetches_files_sharing_a_blob_once(manager, monkeypatch):
+    tree = GitTree(tree=[
+        TreeEntry(path='a.py', type='blob', sha='shared', size=3),
+        TreeEntry(path='b.py', type='blob', sha='shared', size=3),
+    ])
+    blob_requests = []
+
+    def get_blob_content(owner, repo, sha):
+        blob_requests.append(sha)
+        return 'same content', sha
+
+    monkeypatch.setattr(manager, 'get_repository_tree', lambda owner, repo: tree)
+    monkeypatch.setattr(manager, '_get_blob_content', get_blob_content)
+
+    structure = manager.fetch_directory_structure_v2('owner', 'repo', include_content=True)
+
+    assert blob_requests == ['shared']
+    assert [item.metadata['content'] for item in structure.items] == ['same content', 'same content']
+
+
+def test_blob_contents_are_reused_by_later_walks(manager, monkeypatch):
+    listings = {'': [
+        ContentEntry(path='a.py', name='a.py', type='file', size=3, sha='sha-a'),
+        ContentEntry(path='b.py', name='b.py', type='file', size=3, sha='sha-b'),
+    ]}
+    batches = []
+
+    def get_file_contents_batch(owner, repo, paths):
+        batches.append(paths)
+        return {'a.py': 'content of a'}
+
+    monkeypatch.setattr(manager, 'get_repository_contents', lambda owner, repo, path='': listings.get(path))
+    monkeypatch.setattr(manager, '_get_file_contents_batch', get_file_contents_batch)
+    monkeypatch.setattr(manager, '_stream_content', lambda url, hash_content=True: ('content of b', None))
+
+    first = manager.fetch_directory_structure('owner', 'repo')
+    monkeypatch.setattr(manager, '_stream_content', lambda url, hash_content=True: pytest.fail('blob fetched again'))
+    second = manager.fetch_directory_structure('owner', 'repo')
+
+    assert batches == [['a.py', 'b.py']]
+    for structure in (first, second):
+        assert [item.metadata['content'] for item in structure.items] == ['content of a', 'content of b']
+
+
+class FakeRaw:
+    """Stands in for a streamed urllib3 response, handing out one chunk per read."""
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.released = False
+
+    def read(self, amt=None, **kwargs):
+        return self.chunks.pop(0) if self.chunks else b''
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        self.released = True
+
+
+def make_streamed_response(make_response, raw):
+    response = make_response(200)
+    response._content = False
+    response._content_consumed = False
+    response.raw = raw
+    return response
+
+
+def test_stream_content_decodes_characters_split_across_chunks(manager, monkeypatch, make_response):
+    body = 'héllo wörld ✓'.encode('utf-8')
+    # Cut inside the two-byte 'é' and inside the three-byte check mark
+    raw = FakeRaw([body[:2], body[2:15], body[15:]])
+    requests_made = []
+
+    def fake_request(url, **kwargs):
+        requests_made.append((url, kwargs))
+        return make_streamed_response(make_response, raw)
+
+    monkeypatch.setattr(manager_module, 'make_request_with_retry', fake_request)
+
+    text, digest = manager._get_file_content('owner', 'repo', 'docs/readme.md')
+
+    assert text == 'héllo wörld ✓'
+    assert digest == hashlib.blake2b(body, digest_size=16).hexdigest()
+    assert requests_made[0][0] == 'https://api.github.com/repos/owner/repo/contents/docs/readme.md'
+    assert requests_made[0][1]['stream'] is True
+    assert raw.released
+
+
+def test_blob_content_is_fetched_once(manager, monkeypatch, make_response):
+    requests_made = []
+
+    def fake_request(url, **kwargs):
+        requests_made.append(url)
+        return make_streamed_response(make_response, FakeRaw([b'blob ', b'body']))
+
+    monkeypatch.setattr(manager_module, 'make_request_with_retry', fake_request)
+
+    assert manager._get_blob_content('owner', 'repo', 'abc123') == ('blob body', 'abc123')
+    assert manager._get_blob_content('owner', 'repo', 'abc123') == ('blob body', 'abc123')
+    assert requests_made == ['https://api.github.com/repos/owner/repo/git/blobs/abc123']
+
+
+def test_tree_walk_maps_the_subtree_under_a_path(manager, monkeypatch):
+    tree = GitTree(tree=[
+        TreeEntry(path='README.md', type='blob', sha='sha-readme', size=10),
+        TreeEntry(path='src', type='tree', sha='sha-src'),
+        TreeEntry(path='src/main.py', type='blob', sha='sha-main', size=10),
+        TreeEntry(path='src/lib', type='tree', sha='sha-lib'),
+        TreeEntry(path='src/lib/util.py', type='blob', sha='sha-util', size=10),
+        TreeEntry(path='src/vendor', type='commit', sha='sha-vendor'),
+        TreeEntry(path='srcx.py', type='blob', sha='sha-srcx', size=10),
+    ])
+    monkeypatch.setattr(manager, 'get_repository_tree', lambda owner, repo: tree)
+    monkeypatch.setattr(manager, '_get_blob_content', lambda owner, repo, sha: pytest.fail('content fetched without include_content'))
+
+    structure = manager.fetch_directory_structure_v2('owner', 'repo', path='src')
+
+    assert [(item.path, item.level, item.name, item.metadata['type']) for item in structure.items] == [
+        ('src/main.py', 0, 'main.py', 'file'),
+        ('src/lib', 0, 'lib', 'dir'),
+        ('src/lib/util.py', 1, 'util.py', 'file'),
+        ('src/vendor', 0, 'vendor', 'submodule'),
+    ]
+    assert not any(item.metadata.get('content') for item in structure.items)
+
+
+def test_tree_walk_fetches_content_on_request(manager, monkeypatch):
+    tree = GitTree(tree=[
+        TreeEntry(path='main.py', type='blob', sha='sha-main', size=10),
+        TreeEntry(path='logo.png', type='blob', sha='sha-logo', size=10),
+    ])
+    monkeypatch.setattr(manager, 'get_repository_tree', lambda owner, repo: tree)
+    monkeypatch.setattr(manager, '_get_blob_content', lambda owner, repo, sha: ('content of ' + sha, sha))
+
+    structure = manager.fetch_directory_structure_v2('owner', 'repo', include_content=True)
+
+    assert structure.items[0].metadata['content'] == 'content of sha-main'
+    assert structure.items[0].metadata['content_hash'] == 'sha-main'
+    assert structure.items[1].metadata.get('content') is None
+
+
+@pytest.mark.parametrize('include_content', [True, False])
+def test_truncated_tree_falls_back_to_the_contents_walk(manager, monkeypatch, include_content):
+    calls = []
+    monkeypatch.setattr(manager, 'get_repository_tree', lambda owner, repo: GitTree(tree=[], truncated=True))
+    monkeypatch.setattr(manager, 'fetch_directory_structure', lambda *args: calls.append(args) or 'walked')
+
+    assert manager.fetch_directory_structure_v2('owner', 'repo', 'src', include_content) == 'walked'
+    assert calls == [('owner', 'repo', 'src', include_content)]
@@ -0,0 +1,98 @@
+import pytest
+from src.utils import rate_limiter as rate_limiter_module
+from src.utils.rate_limiter import GITHUB_QUOTA, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter_module.time, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(rate_limiter_module.time, 'sleep', clock.sleep)
+    return clock
+
+
+def test_full_quota_does_not_throttle_a_walk(clock):
+    bucket = TokenBucket()
+    for _ in range(500):
+        bucket.acquire()
+        bucket.increase_rate()
+    assert clock.sleeps == []
+    assert bucket.tokens == GITHUB_QUOTA - 500
+
+    bucket.set_budget(remaining=4490, window=3500)
+    for _ in range(500):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+
+def test_spent_tokens_come_back_when_the_window_resets(clock):
+    bucket = TokenBucket(capacity=2, window=60)
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(60)]
+    assert bucket.tokens == 1
+
+
+def test_pushback_paces_requests_and_success_lifts_it(clock):
+    bucket = TokenBucket(min_rate=0.5, max_rate=4.0)
+    bucket.decrease_rate()
+    assert bucket.rate == 2.0
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+    bucket.increase_rate(1.0)
+    assert bucket.rate == 3.0
+    bucket.increase_rate(1.0)
+    assert bucket.rate is None
+
+
+def test_pace_halves_down_to_min_rate(clock):
+    bucket = TokenBucket(min_rate=0.3, max_rate=1.0)
+    bucket.decrease_rate()
+    assert bucket.rate == 0.5
+    bucket.decrease_rate()
+    assert bucket.rate == 0.3
+
+
+def test_budget_follows_the_reported_quota(clock):
+    bucket = TokenBucket()
+    bucket.set_budget(remaining=4000, window=600)
+    assert bucket.tokens == 4000
+    assert bucket.rate is None
+
+    # Within the same window a higher count is a response that left before our latest requests
+    bucket.acquire()
+    bucket.set_budget(remaining=4000, window=600)
+    assert bucket.tokens == 3999
+
+    clock.now += 700
+    bucket.set_budget(remaining=5000, window=3600)
+    assert bucket.tokens == 5000
+
+
+def test_spent_quota_waits_once_for_the_reset(clock):
+    bucket = TokenBucket()
+    bucket.decrease_rate()
+    bucket.decrease_rate()
+    bucket.set_budget(remaining=0, window=100)
+
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(100)]
+    assert bucket.tokens == GITHUB_QUOTA - 1